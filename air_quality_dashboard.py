@@ -1,6 +1,7 @@
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 import dash
 from dash import Dash, dcc, html, Input, Output, callback
 from dash.dependencies import Input, Output
@@ -8,6 +9,102 @@ import numpy as np
 from datetime import datetime, timedelta
 import os
 import traceback
+import functools
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; aggregation falls back to np.bincount
+    njit = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # pyarrow is optional; the sensor CSV falls back to pandas' C parser
+    pa = pacsv = None
+
+try:
+    import orjson  # noqa: F401
+    # Serialize figures (including Dash callback responses) with orjson's numpy fast path
+    pio.json.config.default_engine = 'orjson'
+except ImportError:  # orjson is optional; plotly falls back to the json module
+    pass
+
+# Rows read from the sensor CSV per chunk (pandas reader)
+SENSOR_CSV_CHUNKSIZE = 500_000
+# Bytes read from the sensor CSV per block (pyarrow reader)
+SENSOR_CSV_BLOCK_SIZE = 64 << 20
+
+if njit is not None:
+    @njit(cache=True)
+    def group_sum_count(codes, sums, counts, n):
+        """Add up sums and counts per group code in a single compiled pass"""
+        total_sums = np.zeros(n)
+        total_counts = np.zeros(n)
+        for i in range(codes.size):
+            c = codes[i]
+            total_sums[c] += sums[i]
+            total_counts[c] += counts[i]
+        return total_sums, total_counts
+else:
+    def group_sum_count(codes, sums, counts, n):
+        """Add up sums and counts per group code with np.bincount"""
+        return (np.bincount(codes, weights=sums, minlength=n),
+                np.bincount(codes, weights=counts, minlength=n))
+
+def sum_count_by_keys(keys_df, sums, counts):
+    """
+    Add up sums and counts over the distinct rows of keys_df using factorized codes
+    """
+    codes, uniques = pd.factorize(pd.MultiIndex.from_frame(keys_df), sort=False)
+    # Narrow codes to halve the memory the kernel streams through
+    codes = codes.astype(np.int16 if len(uniques) < 32768 else np.int32)
+    result = uniques.to_frame(index=False, name=list(keys_df.columns))
+    result['sum'], result['count'] = group_sum_count(
+        codes, np.asarray(sums, dtype=np.float64), np.asarray(counts, dtype=np.float64), len(uniques)
+    )
+    return result
+
+def read_sensor_csv_chunks(file_path):
+    """
+    Yield the sensor CSV as DataFrame chunks, using pyarrow's multithreaded CSV reader when installed
+    """
+    # Only parse the columns used downstream; lat/lon are never read
+    columns = ['sensor_id', 'sensor_type', 'location', 'value_type', 'timestamp', 'air_quality_index']
+    
+    if pacsv is not None:
+        # Values are wrapped in single quotes, so let the tokenizer remove them.
+        # Rows with the wrong number of fields (e.g. a truncated last line) are skipped.
+        category = pa.dictionary(pa.int32(), pa.string())
+        reader = pacsv.open_csv(
+            file_path,
+            read_options=pacsv.ReadOptions(block_size=SENSOR_CSV_BLOCK_SIZE, use_threads=True),
+            parse_options=pacsv.ParseOptions(quote_char="'", invalid_row_handler=lambda row: 'skip'),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=columns,
+                column_types={'sensor_id': category, 'sensor_type': category,
+                              'location': category, 'value_type': category,
+                              'timestamp': pa.timestamp('us', tz='UTC'),
+                              'air_quality_index': pa.string()},
+            ),
+        )
+        for batch in reader:
+            yield batch.to_pandas()
+        return
+    
+    # Read CSV with specific parameters for the format
+    yield from pd.read_csv(file_path, 
+                    usecols=columns,
+                    # Low-cardinality text columns are read as categories of strings,
+                    # so cleaning them touches each distinct value once
+                    dtype={'sensor_id': 'category', 'sensor_type': 'category',
+                           'location': 'category', 'value_type': 'category',
+                           'air_quality_index': 'string'},
+                    # Timestamps are quoted ISO 8601 strings, parse them in the reader
+                    parse_dates=['timestamp'],
+                    date_format="'%Y-%m-%dT%H:%M:%S.%f%z'",
+                    # Stream the file so only one chunk of raw rows is held at a time
+                    chunksize=SENSOR_CSV_CHUNKSIZE,
+                    )
 
 def load_and_process_sensor_data(file_path):
     """
@@ -16,36 +113,64 @@ def load_and_process_sensor_data(file_path):
     print("\n=== Loading Air Quality Data ===")
     
     try:
-        # Read CSV with specific parameters for the format
-        df = pd.read_csv(file_path, 
-                        dtype={'sensor_id': str, 'location': str},  # Ensure these are treated as strings
-                        )
-        
-        print(f"Initial data load: {len(df)} rows")
-        
-        # Clean the data
-        # Remove any single quotes from string columns
-        string_columns = ['sensor_id', 'sensor_type', 'location', 'value_type']
-        for col in string_columns:
-            df[col] = df[col].str.strip("'")
+        # Reuse the processed data from the previous run unless the CSV has changed since
+        cache_path = file_path + '.parquet'
+        if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(file_path):
+            try:
+                df_grouped = pd.read_parquet(cache_path, engine='pyarrow')
+                print(f"Loaded {len(df_grouped)} processed records from {cache_path}")
+                return df_grouped
+            except Exception as e:
+                print(f"\nIgnoring unreadable cache {cache_path}: {str(e)}")
         
-        # Convert timestamp to datetime
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        reader = read_sensor_csv_chunks(file_path)
         
-        # Convert air_quality_index to numeric
-        df['air_quality_index'] = pd.to_numeric(df['air_quality_index'].str.strip("'"), errors='coerce')
+        group_keys = ['timestamp', 'location', 'sensor_id']
+        total_rows = 0
+        parts = []
+        for chunk in reader:
+            total_rows += len(chunk)
+            
+            # Clean the data
+            # Remove any stray single quotes from string columns (maps the categories, not the rows)
+            string_columns = ['sensor_id', 'sensor_type', 'location', 'value_type']
+            for col in string_columns:
+                chunk[col] = chunk[col].map(lambda v: v.strip("'"), na_action='ignore')
+            
+            # Convert air_quality_index to numeric
+            chunk['air_quality_index'] = pd.to_numeric(chunk['air_quality_index'].str.strip("'"), errors='coerce')
+            
+            # Filter for only air quality measurements
+            chunk = chunk[chunk['value_type'].isin(['P0', 'P1', 'P2'])]
+            
+            # Pre-aggregate each chunk; a group may span chunks, so keep sum and count
+            chunk = chunk.dropna(subset=group_keys)
+            values = chunk['air_quality_index'].to_numpy(dtype=float, na_value=np.nan)
+            valid = ~np.isnan(values)
+            parts.append(sum_count_by_keys(chunk[group_keys], np.where(valid, values, 0.0), valid))
         
-        # Filter for only air quality measurements
-        df = df[df['value_type'].isin(['P0', 'P1', 'P2'])]
+        print(f"Initial data load: {total_rows} rows")
         
         # Calculate average air quality index for each timestamp and location
-        df_grouped = df.groupby(['timestamp', 'location', 'sensor_id'])['air_quality_index'].mean().reset_index()
+        totals = pd.concat(parts, ignore_index=True)
+        totals = sum_count_by_keys(totals[group_keys], totals['sum'].to_numpy(), totals['count'].to_numpy())
+        df_grouped = totals[group_keys].assign(air_quality_index=totals['sum'] / totals['count'])
+        df_grouped = df_grouped.sort_values(group_keys, ignore_index=True)
+        # Dictionary-encode the low-cardinality text columns
+        df_grouped = df_grouped.astype({'location': 'category', 'sensor_id': 'category'})
+        # AQI values fit comfortably in float32; sums were accumulated in float64 above
+        df_grouped['air_quality_index'] = pd.to_numeric(df_grouped['air_quality_index'], downcast='float')
         
         print(f"\nProcessed data summary:")
         print(f"Number of records: {len(df_grouped)}")
         print(f"Date range: {df_grouped['timestamp'].min()} to {df_grouped['timestamp'].max()}")
         print(f"Locations: {', '.join(df_grouped['location'].unique())}")
         
+        try:
+            df_grouped.to_parquet(cache_path, engine='pyarrow', compression='zstd')
+        except Exception as e:
+            print(f"\nCould not write cache {cache_path}: {str(e)}")
+        
         return df_grouped
         
     except Exception as e:
@@ -59,23 +184,14 @@ def create_sample_data():
     dates = pd.date_range(end=datetime.now(), periods=30, freq='D')
     locations = ['Location A', 'Location B', 'Location C']
     
-    all_dates = []
-    all_locations = []
-    all_aqi = []
-    all_sensors = []
-    
-    for loc in locations:
-        for date in dates:
-            all_dates.append(date)
-            all_locations.append(loc)
-            all_aqi.append(np.random.randint(0, 200))
-            all_sensors.append(f"SENSOR_{np.random.randint(1, 5)}")
+    # One row per (location, date), built with whole-array numpy calls
+    n_rows = len(locations) * len(dates)
     
     df = pd.DataFrame({
-        'timestamp': all_dates,
-        'location': all_locations,
-        'air_quality_index': all_aqi,
-        'sensor_id': all_sensors
+        'timestamp': np.tile(dates.values, len(locations)),
+        'location': np.repeat(locations, len(dates)),
+        'air_quality_index': np.random.randint(0, 200, n_rows),
+        'sensor_id': np.char.add('SENSOR_', np.random.randint(1, 5, n_rows).astype(str))
     })
     
     return df
@@ -93,11 +209,133 @@ def load_research_findings(findings_file, correlations_file):
     
     return findings_df, correlations_df, findings_by_category
 
+def compute_daily_averages(df):
+    """Average air quality index per location and (UTC) day"""
+    date_col = pd.Index(df['timestamp'].values.astype('datetime64[D]'), name='date')
+    return df.groupby(['location', date_col], observed=True)['air_quality_index'].mean().reset_index()
+
+def split_by_location(df, time_col='timestamp'):
+    """Split sensor data into a dict of per-location frames, each sorted by time_col"""
+    return {loc: group.sort_values(time_col) for loc, group in df.groupby('location', sort=False, observed=True)}
+
+def slice_date_range(df, start, end, time_col='timestamp'):
+    """Slice a frame sorted by time_col to the rows between start and end using binary search"""
+    ts = df[time_col].values
+    lo = np.searchsorted(ts, start, side='left')
+    hi = np.searchsorted(ts, end, side='right')
+    return df.iloc[lo:hi]
+
+def to_utc_datetime64(value):
+    """Convert a date picker value to a naive UTC datetime64 comparable with timestamp values"""
+    ts = pd.Timestamp(value)
+    if ts.tz is not None:
+        ts = ts.tz_convert('UTC').tz_localize(None)
+    return ts.to_datetime64()
+
+@functools.lru_cache(maxsize=128)
+def compute_figures(selected_locations, start_date, end_date):
+    """
+    Build the air quality figures and statistics for a filter selection.
+    Figures are returned as dicts so cached results cannot be mutated by callers.
+    """
+    # Take the pre-split location frames instead of scanning sensor_data; nothing
+    # below mutates the result, so no copy is needed
+    locations = selected_locations or list(sensor_data_by_location)
+    frames = {loc: sensor_data_by_location[loc] for loc in locations if loc in sensor_data_by_location}
+    daily_frames = {loc: daily_by_location[loc] for loc in locations if loc in daily_by_location}
+    
+    if start_date and end_date:
+        start, end = to_utc_datetime64(start_date), to_utc_datetime64(end_date)
+        frames = {loc: slice_date_range(frame, start, end) for loc, frame in frames.items()}
+        # Keep every day the range touches
+        start_day, end_day = start.astype('datetime64[D]'), end.astype('datetime64[D]')
+        daily_frames = {loc: slice_date_range(frame, start_day, end_day, time_col='date')
+                        for loc, frame in daily_frames.items()}
+    
+    filtered_df = pd.concat(list(frames.values()) or [sensor_data.iloc[:0]])
+    
+    # Create air quality graph; the location frames are already time-sorted,
+    # so each becomes one WebGL trace straight from its numpy arrays
+    air_quality_fig = go.Figure([
+        go.Scattergl(x=frame['timestamp'].values, y=frame['air_quality_index'].values,
+                     mode='lines', name=loc)
+        for loc, frame in frames.items() if len(frame)
+    ]).update_layout(
+        title='Air Quality Index Over Time',
+        xaxis_title='timestamp',
+        yaxis_title='air_quality_index',
+        legend_title_text='location'
+    )
+    
+    # Create daily trends graph
+    trends_fig = go.Figure([
+        go.Bar(x=frame['date'].values, y=frame['air_quality_index'].values, name=loc)
+        for loc, frame in daily_frames.items() if len(frame)
+    ]).update_layout(
+        title='Daily Average Air Quality Index',
+        xaxis_title='date',
+        yaxis_title='air_quality_index',
+        legend_title_text='location',
+        barmode='relative'
+    )
+    
+    # Calculate statistics for every location in one grouped pass
+    loc_stats = (
+        filtered_df.groupby('location', sort=False, observed=True)['air_quality_index']
+        .agg(['mean', 'max', 'min', 'size'])
+        .reindex(selected_locations or [])
+    )
+    loc_stats['size'] = loc_stats['size'].fillna(0)
+    stats = [
+        html.Div([
+            html.H3(f"Statistics for Location {loc}"),
+            html.P(f"Average AQI: {row['mean']:.2f}"),
+            html.P(f"Maximum AQI: {row['max']:.2f}"),
+            html.P(f"Minimum AQI: {row['min']:.2f}"),
+            html.P(f"Number of readings: {int(row['size'])}")
+        ])
+        for loc, row in loc_stats.iterrows()
+    ]
+    
+    return air_quality_fig.to_dict(), trends_fig.to_dict(), html.Div(stats)
+
 # Initialize the Dash app
 app = Dash(__name__)
 
 # Load the data
 sensor_data = load_and_process_sensor_data('sensor_reading.csv')
+sensor_data_by_location = split_by_location(sensor_data)
+# Daily averages only depend on the data, so compute them once rather than per callback
+daily_averages = compute_daily_averages(sensor_data)
+daily_by_location = split_by_location(daily_averages, time_col='date')
+
+# Load the research findings once; the research findings callback only builds figures from them
+try:
+    findings_df, correlations_df, findings_by_category = load_research_findings(
+        'research_findings.csv', 'health_correlations.csv'
+    )
+    print(f"Loaded correlations data shape: {correlations_df.shape}")
+    
+    # Rows with valid numeric values, and the subset shown in the trends visualization
+    valid_correlations = correlations_df[correlations_df['value'].notna()]
+    print(f"Number of valid numeric values: {len(valid_correlations)}")
+    trends_correlations = valid_correlations[
+        valid_correlations['parameter'].isin(['PM2.5 Levels', 'Health Implications'])
+    ]
+    print(f"Data for trends visualization: {len(trends_correlations)} rows")
+except Exception as e:
+    print(f"\nError loading research findings: {str(e)}")
+    findings_df = correlations_df = findings_by_category = None
+    valid_correlations = trends_correlations = None
+
+# Precompute the default view and ship it with the layout, so the first page load
+# renders without a server callback
+default_locations = [sensor_data['location'].unique()[0]]
+default_start_date = sensor_data['timestamp'].min().isoformat()
+default_end_date = sensor_data['timestamp'].max().isoformat()
+default_air_quality_fig, default_trends_fig, default_stats = compute_figures(
+    tuple(default_locations), default_start_date, default_end_date
+)
 
 # Create the layout
 app.layout = html.Div([
@@ -117,7 +355,7 @@ app.layout = html.Div([
                                 id='location-dropdown',
                                 options=[{'label': f'Location {loc}', 'value': loc} 
                                         for loc in sensor_data['location'].unique()],
-                                value=[sensor_data['location'].unique()[0]],
+                                value=default_locations,
                                 multi=True
                             )
                         ], style={'width': '30%', 'display': 'inline-block', 'padding': '10px'}),
@@ -126,8 +364,8 @@ app.layout = html.Div([
                             html.Label('Date Range'),
                             dcc.DatePickerRange(
                                 id='date-range',
-                                start_date=sensor_data['timestamp'].min(),
-                                end_date=sensor_data['timestamp'].max(),
+                                start_date=default_start_date,
+                                end_date=default_end_date,
                                 display_format='YYYY-MM-DD'
                             )
                         ], style={'width': '30%', 'display': 'inline-block', 'padding': '10px'})
@@ -135,12 +373,12 @@ app.layout = html.Div([
                     
                     # Graphs section
                     html.Div([
-                        dcc.Graph(id='air-quality-graph'),
-                        dcc.Graph(id='trends-graph')
+                        dcc.Graph(id='air-quality-graph', figure=default_air_quality_fig),
+                        dcc.Graph(id='trends-graph', figure=default_trends_fig)
                     ]),
                     
                     # Statistics section
-                    html.Div(id='statistics-section', style={'padding': '20px'})
+                    html.Div(default_stats, id='statistics-section', style={'padding': '20px'})
                 ]),
                 
                 dcc.Tab(label='Research Findings', children=[
@@ -223,53 +461,14 @@ list_item_style = {
      Output('statistics-section', 'children')],
     [Input('location-dropdown', 'value'),
      Input('date-range', 'start_date'),
-     Input('date-range', 'end_date')]
+     Input('date-range', 'end_date')],
+    # The layout already holds the default view
+    prevent_initial_call=True
 )
 def update_figures(selected_locations, start_date, end_date):
-    filtered_df = sensor_data.copy()
-    
-    if selected_locations:
-        filtered_df = filtered_df[filtered_df['location'].isin(selected_locations)]
-    
-    if start_date and end_date:
-        filtered_df = filtered_df[
-            (filtered_df['timestamp'] >= start_date) &
-            (filtered_df['timestamp'] <= end_date)
-        ]
-    
-    # Create air quality graph
-    air_quality_fig = px.line(
-        filtered_df,
-        x='timestamp',
-        y='air_quality_index',
-        color='location',
-        title='Air Quality Index Over Time'
-    )
-    
-    # Create daily trends graph
-    filtered_df['date'] = filtered_df['timestamp'].dt.date
-    daily_avg = filtered_df.groupby(['location', 'date'])['air_quality_index'].mean().reset_index()
-    trends_fig = px.bar(
-        daily_avg,
-        x='date',
-        y='air_quality_index',
-        color='location',
-        title='Daily Average Air Quality Index'
-    )
-    
-    # Calculate statistics
-    stats = []
-    for loc in selected_locations:
-        loc_data = filtered_df[filtered_df['location'] == loc]
-        stats.append(html.Div([
-            html.H3(f"Statistics for Location {loc}"),
-            html.P(f"Average AQI: {loc_data['air_quality_index'].mean():.2f}"),
-            html.P(f"Maximum AQI: {loc_data['air_quality_index'].max():.2f}"),
-            html.P(f"Minimum AQI: {loc_data['air_quality_index'].min():.2f}"),
-            html.P(f"Number of readings: {len(loc_data)}")
-        ]))
-    
-    return air_quality_fig, trends_fig, html.Div(stats)
+    # Sort so the same selection made in a different order reuses the cached result
+    return compute_figures(tuple(sorted(selected_locations or [])), start_date, end_date)
+
 
 @app.callback(
     [Output('findings-distribution', 'figure'),
@@ -280,19 +479,9 @@ def update_figures(selected_locations, start_date, end_date):
 def update_research_findings(tab):
     print("\n=== Updating Research Findings ===")
     try:
-        # Load and process data
-        correlations_df = pd.read_csv('health_correlations.csv')
-        print(f"Loaded correlations data shape: {correlations_df.shape}")
-        
-        correlations_df['value'] = pd.to_numeric(correlations_df['value'], errors='coerce')
-        print(f"Number of valid numeric values: {correlations_df['value'].notna().sum()}")
-        
         # Create health metrics visualization
-        valid_data = correlations_df[correlations_df['value'].notna()]
-        print(f"Data for health metrics visualization: {len(valid_data)} rows")
-        
         health_metrics = px.bar(
-            valid_data,
+            valid_correlations,
             x='parameter',
             y='value',
             color='parameter',
@@ -302,14 +491,11 @@ def update_research_findings(tab):
         )
         
         # Create trends visualization
-        trends_data = correlations_df[correlations_df['parameter'].isin(['PM2.5 Levels', 'Health Implications'])]
-        print(f"Data for trends visualization: {len(trends_data)} rows")
-        
         trends_viz = px.scatter(
-            trends_data[trends_data['value'].notna()],  # Only use rows with valid values
+            trends_correlations,
             x='parameter',
             y='value',
-            size=[20] * len(trends_data[trends_data['value'].notna()]),  # Match size array to filtered data
+            size=[20] * len(trends_correlations),  # Match size array to filtered data
             title='Health Correlations Overview'
         )
         
@@ -409,12 +595,7 @@ def create_finding_card(title, points):
 
 if __name__ == '__main__':
     print("\n=== Air Quality Dashboard Initialization ===")
-    # Load sensor data
-    sensor_data = load_and_process_sensor_data('sensor_reading.csv')
-    # Load research findings
-    findings_df, correlations_df, findings_by_category = load_research_findings(
-        'research_findings.csv', 'health_correlations.csv'
-    )
+    # Sensor data and research findings are already loaded at module scope
     print("\nServer starting at http://127.0.0.1:8050/")
     print("\nPress Ctrl+C to quit")
     app.run_server(debug=True)
\ No newline at end of file